@@ -4,17 +4,31 @@
 import readline
 import os
 import sys
+from bisect import bisect_left
+
+# macOS ships libedit instead of GNU readline, which needs a different
+# binding syntax. readline.__doc__ can be None on some builds.
+if readline.__doc__ and 'libedit' in readline.__doc__:
+    _TAB_BINDING = "bind ^I rl_complete"
+else:
+    _TAB_BINDING = "tab: complete"
 
 class Completer:
     def __init__(self, options):
-        self.options = options
+        # Keep options sorted so prefix matches form a contiguous run
+        self.options = sorted(options)
         self.matches = []
     
     def complete(self, text, state):
         if state == 0:
             # This is the first time for this text, so build a match list
             if text:
-                self.matches = [s for s in self.options if s.startswith(text)]
+                # Jump to the first candidate and walk forward while the prefix holds
+                start = bisect_left(self.options, text)
+                end = start
+                while end < len(self.options) and self.options[end].startswith(text):
+                    end += 1
+                self.matches = self.options[start:end]
             else:
                 self.matches = self.options[:]
         
@@ -33,13 +47,7 @@ def setup_completion(keywords):
     """
     completer = Completer(keywords)
     readline.set_completer(completer.complete)
-    
-    # Use different bind settings based on OS
-    if 'libedit' in readline.__doc__:
-        # macOS uses libedit instead of GNU readline
-        readline.parse_and_bind("bind ^I rl_complete")
-    else:
-        readline.parse_and_bind("tab: complete")
+    readline.parse_and_bind(_TAB_BINDING)
     
 def main():
     """Test the autocomplete functionality"""
@@ -2,13 +2,7 @@
 # PAW Banner Module
 # Display ASCII art banner for PAW
 
-try:
-    from rich.console import Console
-    from rich.panel import Panel
-    from rich import box
-    RICH_AVAILABLE = True
-except ImportError:
-    RICH_AVAILABLE = False
+import sys
 
 # ASCII art banner
 PAW_BANNER = r"""
@@ -33,34 +27,52 @@ PAW_SUBTITLE = "Prompt Assistant for Wireless"
 PAW_VERSION = "v0.1"
 PAW_AUTHOR = "Created for educational purposes only"
 
+# Pre-rendered banner text, built once at import instead of on every call
+_RICH_SUBTITLE = f"[bold cyan]{PAW_SUBTITLE}[/bold cyan] [dim]{PAW_VERSION}[/dim]"
+_RICH_AUTHOR = f"[dim italic]{PAW_AUTHOR}[/dim italic]"
+_PLAIN_BANNER = f"\n{PAW_BANNER}\n{PAW_SUBTITLE} {PAW_VERSION}\n{PAW_AUTHOR}\n\n"
+_PLAIN_EXIT_MESSAGE = "\nThanks for using PAW!\nStay safe and ethical in your wireless testing.\n\n"
+
+# Shared console and banner renderable, created on first use so that
+# importing this module doesn't pull in rich
+_CONSOLE = None
+_BANNER_TEXT = None
+_RICH_CHECKED = False
+
+def _get_console():
+    """Return the shared rich Console, or None if rich isn't installed"""
+    global _CONSOLE, _BANNER_TEXT, _RICH_CHECKED
+    if not _RICH_CHECKED:
+        _RICH_CHECKED = True
+        try:
+            from rich.console import Console
+            from rich.text import Text
+        except ImportError:
+            return None
+        _CONSOLE = Console()
+        _BANNER_TEXT = Text(PAW_BANNER, style="bold cyan")
+    return _CONSOLE
+
 def print_banner():
     """Print the PAW banner"""
-    if RICH_AVAILABLE:
-        console = Console()
-        
+    if _get_console():
         # Create a stylized banner using rich
-        console.print("")
-        console.print(PAW_BANNER, style="bold cyan", highlight=False)
-        console.print(f"[bold cyan]{PAW_SUBTITLE}[/bold cyan] [dim]{PAW_VERSION}[/dim]")
-        console.print(f"[dim italic]{PAW_AUTHOR}[/dim italic]")
-        console.print("")
+        _CONSOLE.print("")
+        _CONSOLE.print(_BANNER_TEXT)
+        _CONSOLE.print(_RICH_SUBTITLE)
+        _CONSOLE.print(_RICH_AUTHOR)
+        _CONSOLE.print("")
     else:
         # Fallback to plain text
-        print("")
-        print(PAW_BANNER)
-        print(f"{PAW_SUBTITLE} {PAW_VERSION}")
-        print(f"{PAW_AUTHOR}")
-        print("")
+        sys.stdout.write(_PLAIN_BANNER)
 
 def print_exit_message():
     """Print exit message"""
-    if RICH_AVAILABLE:
-        console = Console()
-        console.print("\n[bold cyan]Thanks for using PAW![/bold cyan]")
-        console.print("[dim italic]Stay safe and ethical in your wireless testing.[/dim italic]\n")
+    if _get_console():
+        _CONSOLE.print("\n[bold cyan]Thanks for using PAW![/bold cyan]")
+        _CONSOLE.print("[dim italic]Stay safe and ethical in your wireless testing.[/dim italic]\n")
     else:
-        print("\nThanks for using PAW!")
-        print("Stay safe and ethical in your wireless testing.\n")
+        sys.stdout.write(_PLAIN_EXIT_MESSAGE)
 
 if __name__ == "__main__":
     # Test the banner
@@ -3,6 +3,8 @@
 # Provides context for user prompts based on keywords
 
 import re
+import sys
+from functools import lru_cache
 from typing import Optional, Dict, List, Any
 
 # Import prompts
@@ -298,10 +300,126 @@ KALI_TOOLS = {
     }
 }
 
+# Prompts are split into lowercase word tokens. Tool names are single tokens
+# (hyphens included), so spotting a tool mention is one dict lookup per token
+# and a whole-word match (e.g. "dirbuster" never resolves to "dirb").
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9_\-]*")
+# Keys are casefolded like prompts (names are ASCII, so this equals lower()) and
+# interned so they share storage with the identical literals
+_KALI_TOOL_NAMES = {sys.intern(name.casefold()): name for name in KALI_TOOLS}
+
+# Aircrack-ng suite tools with their own prompt entries, checked by direct mention
+_AIRCRACK_DIRECT = tuple(
+    (name, AIRCRACK_PROMPTS[name])
+    for name in ("airmon-ng", "airodump-ng", "aireplay-ng", "aircrack-ng")
+    if name in AIRCRACK_PROMPTS
+)
+
+# Keyword to context table, in priority order. Lookups are resolved once here;
+# keywords without a context in the prompts library are dropped.
+_KEYWORD_CONTEXTS = {keyword: context_info for keyword, context_info in (
+    # Aircrack related
+    ("monitor mode", AIRCRACK_PROMPTS.get("airmon-ng")),
+    ("monitor", AIRCRACK_PROMPTS.get("airmon-ng")),
+    ("packet capture", AIRCRACK_PROMPTS.get("airodump-ng")),
+    ("capture", AIRCRACK_PROMPTS.get("airodump-ng")),
+    ("deauth", AIRCRACK_PROMPTS.get("aireplay-ng")),
+    ("crack", AIRCRACK_PROMPTS.get("aircrack-ng")),
+    ("wpa", AIRCRACK_PROMPTS.get("aircrack-ng")),
+    
+    # Network related
+    ("scan", NETWORK_PROMPTS.get("scanning")),
+    ("network", NETWORK_PROMPTS.get("scanning")),
+    ("packet", NETWORK_PROMPTS.get("packet_capture")),
+    ("wifi", NETWORK_PROMPTS.get("wifi")),
+    ("wireless", NETWORK_PROMPTS.get("wifi"))
+) if context_info}
+_KEYWORD_RANK = {keyword: rank for rank, keyword in enumerate(_KEYWORD_CONTEXTS)}
+
+# Tool types/categories, in priority order
+_TOOL_CATEGORIES = {
+    "wireless": ["aircrack-ng", "airmon-ng", "airodump-ng", "aireplay-ng", "wifite", "reaver", "bully", "fern-wifi-cracker"],
+    "scanner": ["nmap", "masscan", "nikto", "wpscan", "sqlmap", "gobuster", "dirb"],
+    "password": ["hydra", "john", "hashcat", "crunch", "medusa"],
+    "exploit": ["metasploit", "msfconsole", "msfvenom"],
+    "packet": ["wireshark", "tshark", "tcpdump", "ettercap", "bettercap"],
+    "forensic": ["autopsy", "foremost", "binwalk", "volatility"],
+}
+
+# Words that fall back to general aircrack or networking info
+_AIRCRACK_FALLBACK = frozenset({"aircrack", "wireless", "wifi", "wlan", "monitor"})
+_NETWORK_FALLBACK = frozenset({"network", "scan", "capture", "packet"})
+
+# Field set shared by most KALI_TOOLS entries, formatted without the generic path
+_COMMON_KALI_FIELDS = {"description", "main_options", "examples"}
+
+# Labelled fields of a KALI_TOOLS entry in output order, with an optional renderer
+# for non-string values; examples are formatted separately
+_KALI_INFO_FIELDS = (
+    ("Description: ", "description", None),
+    ("Related commands: ", "commands", ", ".join),
+    ("Main options: ", "main_options", None),
+    ("Main commands: ", "main_commands", None),
+)
+
+# Longest prompt prefix considered for matching
+_MAX_PROMPT_CHARS = 4096
+
+# Key marking the end of a phrase in a trie node (never a single character)
+_TRIE_END = ""
+
+def _build_trie(phrases) -> Dict[str, Any]:
+    """Build a nested-dict character trie; terminal nodes store the phrase under _TRIE_END"""
+    root: Dict[str, Any] = {}
+    for phrase in phrases:
+        node = root
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[_TRIE_END] = phrase
+    return root
+
+# Every category, keyword and fallback trigger in one trie, so a single walk over the
+# prompt finds all of them. Triggers match at the start of a word, which keeps
+# stems working ("deauth" in "deauthenticate", "password" in "passwords").
+_TRIGGER_TRIE = _build_trie(
+    set(_TOOL_CATEGORIES)
+    | _KEYWORD_CONTEXTS.keys()
+    | _AIRCRACK_FALLBACK
+    | _NETWORK_FALLBACK
+)
+
+def _match_triggers(tokens: List[str]) -> set:
+    """
+    Find every trigger phrase that starts at one of the prompt's words
+    
+    Args:
+        tokens: Lowercase word tokens of the prompt
+        
+    Returns:
+        Set of matched trigger phrases
+    """
+    hits = set()
+    for i, token in enumerate(tokens):
+        # Run on into the next word so two-word triggers like "monitor mode"
+        # are found in the same walk
+        text = f"{token} {tokens[i + 1]}" if i + 1 < len(tokens) else token
+        node = _TRIGGER_TRIE
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                break
+            if _TRIE_END in node:
+                hits.add(node[_TRIE_END])
+    return hits
+
 def get_context_for_prompt(prompt: str, previous_output: Optional[str] = None) -> Optional[str]:
     """
     Get contextual information based on keyword matching from user prompt
     
+    Only the first _MAX_PROMPT_CHARS characters (after whitespace normalization)
+    are matched, so pasted command output cannot blow up matching time or the
+    result cache. The user's own text comes first, so it is always covered.
+    
     Args:
         prompt: The user's input prompt
         previous_output: Optional output from previous command
@@ -309,75 +427,54 @@ def get_context_for_prompt(prompt: str, previous_output: Optional[str] = None) -
     Returns:
         Context information as a formatted string, or None if no context found
     """
-    prompt = prompt.lower()
+    # Normalize case and whitespace so repeated prompts share a cache entry
+    return _context_for_normalized_prompt(" ".join(prompt.casefold().split())[:_MAX_PROMPT_CHARS])
+
+@lru_cache(maxsize=256)
+def _context_for_normalized_prompt(prompt: str) -> Optional[str]:
+    """
+    Match a normalized (casefolded, single-spaced) prompt against the context tables
+    
+    Results are cached, since users often repeat the same question.
+    
+    Args:
+        prompt: The normalized user prompt
+        
+    Returns:
+        Context information as a formatted string, or None if no context found
+    """
+    tokens = _TOKEN_RE.findall(prompt)
     
     # First check for exact tool mentions in Kali tools
-    for tool_name, tool_info in KALI_TOOLS.items():
-        if tool_name.lower() in prompt:
-            return format_kali_tool_info(tool_name, tool_info)
+    for token in tokens:
+        if token in _KALI_TOOL_NAMES:
+            return _KALI_FORMATTED[_KALI_TOOL_NAMES[token]]
     
     # Check for specific aircrack tools first (direct mentions)
-    if "airmon-ng" in prompt and "airmon-ng" in AIRCRACK_PROMPTS:
-        return format_tool_info("airmon-ng", AIRCRACK_PROMPTS["airmon-ng"])
-    
-    if "airodump-ng" in prompt and "airodump-ng" in AIRCRACK_PROMPTS:
-        return format_tool_info("airodump-ng", AIRCRACK_PROMPTS["airodump-ng"])
+    for tool_name, formatted in _AIRCRACK_FORMATTED.items():
+        if tool_name in prompt:
+            return formatted
     
-    if "aireplay-ng" in prompt and "aireplay-ng" in AIRCRACK_PROMPTS:
-        return format_tool_info("aireplay-ng", AIRCRACK_PROMPTS["aireplay-ng"])
-    
-    if "aircrack-ng" in prompt and "aircrack-ng" in AIRCRACK_PROMPTS:
-        return format_tool_info("aircrack-ng", AIRCRACK_PROMPTS["aircrack-ng"])
+    # Find all category and keyword triggers in one pass
+    triggers = _match_triggers(tokens)
     
     # Check for tool types/categories
-    tool_categories = {
-        "wireless": ["aircrack-ng", "airmon-ng", "airodump-ng", "aireplay-ng", "wifite", "reaver", "bully", "fern-wifi-cracker"],
-        "scanner": ["nmap", "masscan", "nikto", "wpscan", "sqlmap", "gobuster", "dirb"],
-        "password": ["hydra", "john", "hashcat", "crunch", "medusa"],
-        "exploit": ["metasploit", "msfconsole", "msfvenom"],
-        "packet": ["wireshark", "tshark", "tcpdump", "ettercap", "bettercap"],
-        "forensic": ["autopsy", "foremost", "binwalk", "volatility"],
-    }
+    for category in _TOOL_CATEGORIES:
+        if category in triggers:
+            return _CATEGORY_RESPONSES[category]
     
-    for category, tools in tool_categories.items():
-        if category in prompt:
-            context = f"Tools for {category} in Kali Linux include: {', '.join(tools)}"
-            for tool in tools:
-                if tool in KALI_TOOLS:
-                    context += f"\n\n{format_kali_tool_info(tool, KALI_TOOLS[tool])}"
-                    # Just return info about the first matching tool to avoid overwhelming
-                    return context
-            return context
-    
-    # Check for keyword matches and return the appropriate context
-    keywords_to_check = [
-        # Aircrack related
-        ("monitor mode", AIRCRACK_PROMPTS.get("airmon-ng")),
-        ("monitor", AIRCRACK_PROMPTS.get("airmon-ng")),
-        ("packet capture", AIRCRACK_PROMPTS.get("airodump-ng")),
-        ("capture", AIRCRACK_PROMPTS.get("airodump-ng")),
-        ("deauth", AIRCRACK_PROMPTS.get("aireplay-ng")),
-        ("crack", AIRCRACK_PROMPTS.get("aircrack-ng")),
-        ("wpa", AIRCRACK_PROMPTS.get("aircrack-ng")),
-        
-        # Network related
-        ("scan", NETWORK_PROMPTS.get("scanning")),
-        ("network", NETWORK_PROMPTS.get("scanning")),
-        ("packet", NETWORK_PROMPTS.get("packet_capture")),
-        ("wifi", NETWORK_PROMPTS.get("wifi")),
-        ("wireless", NETWORK_PROMPTS.get("wifi"))
-    ]
-    
-    for keyword, context_info in keywords_to_check:
-        if keyword in prompt and context_info:
-            return format_tool_info(keyword, context_info)
+    # Check for keyword matches; the highest-priority keyword wins
+    keywords = triggers & _KEYWORD_CONTEXTS.keys()
+    if keywords:
+        keyword = min(keywords, key=_KEYWORD_RANK.__getitem__)
+        return format_tool_info(keyword, _KEYWORD_CONTEXTS[keyword])
     
     # If no specific matches, return general info about aircrack
-    if any(word in prompt for word in ["aircrack", "wireless", "wifi", "wlan", "monitor"]):
+    if triggers & _AIRCRACK_FALLBACK:
         return AIRCRACK_PROMPTS.get("general")
     
     # If no specific matches, return general info about networking
-    if any(word in prompt for word in ["network", "scan", "capture", "packet"]):
+    if triggers & _NETWORK_FALLBACK:
         return NETWORK_PROMPTS.get("general")
     
     # No relevant context found
@@ -403,9 +500,7 @@ def format_tool_info(name: str, info: Dict[str, Any]) -> str:
         result.append(f"\nUsage: {info['usage']}")
     
     if "examples" in info and isinstance(info["examples"], list):
-        result.append("\nExamples:")
-        for example in info["examples"]:
-            result.append(f"  {example}")
+        result.append("\nExamples:" + "".join(f"\n  {example}" for example in info["examples"]))
     
     if "common_tools" in info and isinstance(info["common_tools"], list):
         result.append(f"\nCommon tools: {', '.join(info['common_tools'])}")
@@ -423,27 +518,42 @@ def format_kali_tool_info(name: str, info: Dict[str, Any]) -> str:
     Returns:
         Formatted string with tool information
     """
-    result = [f"{name.upper()}"]
+    upper_name = name.upper()
     
-    if "description" in info:
-        result.append(f"Description: {info['description']}")
+    # Most tools carry exactly a description, main options and examples
+    if info.keys() == _COMMON_KALI_FIELDS and isinstance(info["examples"], list):
+        examples = "".join(f"\n  {example}" for example in info["examples"])
+        return (f"{upper_name}\nDescription: {info['description']}"
+                f"\nMain options: {info['main_options']}\nExamples:{examples}")
     
-    if "commands" in info:
-        result.append(f"Related commands: {', '.join(info['commands'])}")
+    result = [upper_name]
     
-    if "main_options" in info:
-        result.append(f"Main options: {info['main_options']}")
-        
-    if "main_commands" in info:
-        result.append(f"Main commands: {info['main_commands']}")
+    for label, key, render in _KALI_INFO_FIELDS:
+        if key in info:
+            result.append(label + (render(info[key]) if render else info[key]))
     
     if "examples" in info and isinstance(info["examples"], list):
-        result.append("Examples:")
-        for example in info["examples"]:
-            result.append(f"  {example}")
+        result.append("Examples:" + "".join(f"\n  {example}" for example in info["examples"]))
     
     return "\n".join(result)
 
+# The tool tables never change at runtime, so each tool's formatted info is built once
+_KALI_FORMATTED = {name: format_kali_tool_info(name, info) for name, info in KALI_TOOLS.items()}
+_AIRCRACK_FORMATTED = {name: format_tool_info(name, info) for name, info in _AIRCRACK_DIRECT}
+
+def _build_category_response(category: str, tools: List[str]) -> str:
+    """Build the response for a category: its tool list plus info on the first known tool"""
+    context = f"Tools for {category} in Kali Linux include: {', '.join(tools)}"
+    
+    # Only describe the first tool in KALI_TOOLS, to avoid overwhelming the model
+    first_known = next((tool for tool in tools if tool in _KALI_FORMATTED), None)
+    if first_known:
+        context += f"\n\n{_KALI_FORMATTED[first_known]}"
+    
+    return context
+
+_CATEGORY_RESPONSES = {category: _build_category_response(category, tools) for category, tools in _TOOL_CATEGORIES.items()}
+
 if __name__ == "__main__":
     # Test the context extraction
     test_prompts = [
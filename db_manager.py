@@ -2,31 +2,106 @@
 # PAW Database Manager
 # Handles storage and retrieval of captured network information
 
-import os
 import csv
-import json
 import sqlite3
-from datetime import datetime
+import time
 from typing import List, Dict, Optional, Any
 
+# Optional columns accepted by add_network/add_client, in upsert parameter order
+_NETWORK_FIELDS = ('essid', 'channel', 'encryption', 'signal_strength', 'latitude', 'longitude', 'notes')
+_CLIENT_FIELDS = ('network_id', 'probed_essids')
+
+# Explicit column lists for reads; the listing view leaves out the bulky
+# location and notes columns, which get_network still returns
+_NETWORK_COLUMNS = 'id, bssid, essid, channel, encryption, signal_strength, first_seen, last_seen, latitude, longitude, notes'
+_NETWORK_LIST_COLUMNS = 'id, bssid, essid, channel, encryption, signal_strength, first_seen, last_seen'
+_CLIENT_COLUMNS = 'id, mac_address, network_id, first_seen, last_seen, probed_essids'
+
+# Rows fetched per round trip when exporting to CSV
+_EXPORT_CHUNK_SIZE = 10000
+
+# Current local time as ISO 8601 (millisecond precision), evaluated by SQLite
+# so timestamps need no Python call or bound parameter
+_NOW_SQL = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')"
+
+def _build_upsert_sql(table: str, key: str, fields: tuple) -> str:
+    """
+    Build an upsert that inserts new rows and, for existing ones, only
+    overwrites the fields given as non-None; first_seen is kept on update
+    """
+    columns = (key,) + fields + ('first_seen', 'last_seen')
+    placeholders = ['?'] * (len(fields) + 1) + [_NOW_SQL, _NOW_SQL]
+    updates = [f"{field} = COALESCE(excluded.{field}, {field})" for field in fields]
+    updates.append("last_seen = excluded.last_seen")
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join(placeholders)}) "
+        f"ON CONFLICT({key}) DO UPDATE SET {', '.join(updates)}"
+    )
+
+# Constant statements, so sqlite3's statement cache compiles each one only once
+_UPSERT_NETWORK_SQL = _build_upsert_sql('networks', 'bssid', _NETWORK_FIELDS)
+_UPSERT_CLIENT_SQL = _build_upsert_sql('clients', 'mac_address', _CLIENT_FIELDS)
+
+def _network_params(network_data: Dict[str, Any]) -> tuple:
+    """Upsert parameters for a network: its bssid followed by _NETWORK_FIELDS"""
+    return (network_data['bssid'], *map(network_data.get, _NETWORK_FIELDS))
+
+def _client_params(client_data: Dict[str, Any]) -> tuple:
+    """Upsert parameters for a client: its mac_address followed by _CLIENT_FIELDS"""
+    return (client_data['mac_address'], *map(client_data.get, _CLIENT_FIELDS))
+
 class NetworkDatabase:
     """Class to manage storage of wireless networks and related information"""
     
-    def __init__(self, db_path: str = "paw_networks.db"):
-        """Initialize the database connection"""
+    def __init__(self, db_path: str = "paw_networks.db", stage_in_memory: bool = False,
+                 flush_interval: float = 5.0):
+        """
+        Initialize the database connection
+        
+        Args:
+            db_path: Path of the SQLite database file
+            stage_in_memory: Work on an in-memory copy of the database and write it
+                back to db_path at most every flush_interval seconds and on close().
+                Much faster for heavy capture ingest, but a crash loses the writes
+                made since the last flush.
+            flush_interval: Seconds between write-backs when staging in memory
+        """
         self.db_path = db_path
         self.connection = None
-        self.cursor = None
+        self._closed = False
+        self.stage_in_memory = stage_in_memory
+        self.flush_interval = flush_interval
+        self._disk = None
+        self._last_flush = time.monotonic()
         self._initialize_db()
         
     def _initialize_db(self):
         """Create the database and tables if they don't exist"""
         try:
-            self.connection = sqlite3.connect(self.db_path)
-            self.cursor = self.connection.cursor()
+            if self.stage_in_memory:
+                # Load the existing database into memory; flush() writes it back
+                self._disk = sqlite3.connect(self.db_path)
+                self.connection = sqlite3.connect(":memory:")
+                self._disk.backup(self.connection)
+            else:
+                self.connection = sqlite3.connect(self.db_path)
+            # Rows support access by column name, so no per-row zip with the description
+            self.connection.row_factory = sqlite3.Row
+            
+            # Tune for a write-heavy capture workload: WAL lets reads run alongside
+            # writes, and NORMAL sync is still safe against corruption in WAL mode
+            if self.db_path != ":memory:" and not self.stage_in_memory:
+                self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute("PRAGMA temp_store=MEMORY")
+            self.connection.execute("PRAGMA cache_size=-20000")
+            
+            # Create the tables and their indexes in one script and one transaction;
+            # the indexes serve the listing queries, which filter and sort by these columns
+            self.connection.executescript('''
+            BEGIN;
             
-            # Create networks table
-            self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS networks (
                 id INTEGER PRIMARY KEY,
                 bssid TEXT UNIQUE,
@@ -39,11 +114,8 @@ class NetworkDatabase:
                 latitude REAL,
                 longitude REAL,
                 notes TEXT
-            )
-            ''')
+            );
             
-            # Create clients table
-            self.cursor.execute('''
             CREATE TABLE IF NOT EXISTS clients (
                 id INTEGER PRIMARY KEY,
                 mac_address TEXT UNIQUE,
@@ -52,10 +124,15 @@ class NetworkDatabase:
                 last_seen TEXT,
                 probed_essids TEXT,
                 FOREIGN KEY (network_id) REFERENCES networks (id)
-            )
-            ''')
+            );
             
-            self.connection.commit()
+            CREATE INDEX IF NOT EXISTS idx_clients_network_last_seen
+                ON clients (network_id, last_seen DESC);
+            CREATE INDEX IF NOT EXISTS idx_networks_last_seen
+                ON networks (last_seen DESC);
+            
+            COMMIT;
+            ''')
         except sqlite3.Error as e:
             print(f"Database initialization error: {e}")
             
@@ -77,73 +154,39 @@ class NetworkDatabase:
             if 'bssid' not in network_data:
                 return False
                 
-            # Prepare current timestamp
-            now = datetime.now().isoformat()
-            
-            # Check if network exists
-            self.cursor.execute(
-                "SELECT id, first_seen FROM networks WHERE bssid = ?", 
-                (network_data['bssid'],)
-            )
-            result = self.cursor.fetchone()
-            
-            if result:
-                # Network exists, update it
-                network_id, first_seen = result
-                
-                # Prepare update statement
-                update_fields = []
-                params = []
-                
-                for key, value in network_data.items():
-                    if key != 'bssid' and value is not None:
-                        update_fields.append(f"{key} = ?")
-                        params.append(value)
-                
-                # Always update last_seen
-                update_fields.append("last_seen = ?")
-                params.append(now)
-                
-                # Add bssid as the last parameter for WHERE clause
-                params.append(network_data['bssid'])
-                
-                # Execute update
-                self.cursor.execute(
-                    f"UPDATE networks SET {', '.join(update_fields)} WHERE bssid = ?",
-                    params
-                )
-                
-                return True
-            else:
-                # New network, insert it
-                keys = ['bssid']
-                values = [network_data['bssid']]
-                placeholders = ['?']
-                
-                for key, value in network_data.items():
-                    if key != 'bssid' and value is not None:
-                        keys.append(key)
-                        values.append(value)
-                        placeholders.append('?')
-                
-                # Add timestamps
-                keys.extend(['first_seen', 'last_seen'])
-                values.extend([now, now])
-                placeholders.extend(['?', '?'])
-                
-                # Execute insert
-                self.cursor.execute(
-                    f"INSERT INTO networks ({', '.join(keys)}) VALUES ({', '.join(placeholders)})",
-                    values
-                )
-                
-                self.connection.commit()
-                return True
+            # The connection context commits on success and rolls back on error
+            with self.connection:
+                self.connection.execute(_UPSERT_NETWORK_SQL, _network_params(network_data))
+            self._maybe_flush()
+            return True
                 
         except sqlite3.Error as e:
             print(f"Error adding network: {e}")
             return False
     
+    def add_networks(self, networks: List[Dict[str, Any]]) -> int:
+        """
+        Add or update several networks in a single transaction
+        
+        Args:
+            networks: List of network dictionaries, as accepted by add_network
+                
+        Returns:
+            Number of networks stored (entries without a bssid are skipped)
+        """
+        try:
+            # The upsert needs no existence check first, so the whole batch goes
+            # through one executemany and one commit
+            rows = [_network_params(network_data) for network_data in networks if 'bssid' in network_data]
+            with self.connection:
+                self.connection.executemany(_UPSERT_NETWORK_SQL, rows)
+            self._maybe_flush()
+            return len(rows)
+                
+        except sqlite3.Error as e:
+            print(f"Error adding networks: {e}")
+            return 0
+    
     def add_client(self, client_data: Dict[str, Any]) -> bool:
         """
         Add or update a client in the database
@@ -161,87 +204,51 @@ class NetworkDatabase:
             if 'mac_address' not in client_data:
                 return False
                 
-            # Prepare current timestamp
-            now = datetime.now().isoformat()
-            
-            # Check if client exists
-            self.cursor.execute(
-                "SELECT id, first_seen FROM clients WHERE mac_address = ?", 
-                (client_data['mac_address'],)
-            )
-            result = self.cursor.fetchone()
-            
-            if result:
-                # Client exists, update it
-                client_id, first_seen = result
-                
-                # Prepare update statement
-                update_fields = []
-                params = []
-                
-                for key, value in client_data.items():
-                    if key != 'mac_address' and value is not None:
-                        update_fields.append(f"{key} = ?")
-                        params.append(value)
-                
-                # Always update last_seen
-                update_fields.append("last_seen = ?")
-                params.append(now)
-                
-                # Add mac_address as the last parameter for WHERE clause
-                params.append(client_data['mac_address'])
-                
-                # Execute update
-                self.cursor.execute(
-                    f"UPDATE clients SET {', '.join(update_fields)} WHERE mac_address = ?",
-                    params
-                )
-                
-                self.connection.commit()
-                return True
-            else:
-                # New client, insert it
-                keys = ['mac_address']
-                values = [client_data['mac_address']]
-                placeholders = ['?']
-                
-                for key, value in client_data.items():
-                    if key != 'mac_address' and value is not None:
-                        keys.append(key)
-                        values.append(value)
-                        placeholders.append('?')
-                
-                # Add timestamps
-                keys.extend(['first_seen', 'last_seen'])
-                values.extend([now, now])
-                placeholders.extend(['?', '?'])
-                
-                # Execute insert
-                self.cursor.execute(
-                    f"INSERT INTO clients ({', '.join(keys)}) VALUES ({', '.join(placeholders)})",
-                    values
-                )
-                
-                self.connection.commit()
-                return True
+            # The connection context commits on success and rolls back on error
+            with self.connection:
+                self.connection.execute(_UPSERT_CLIENT_SQL, _client_params(client_data))
+            self._maybe_flush()
+            return True
                 
         except sqlite3.Error as e:
             print(f"Error adding client: {e}")
             return False
     
+    def add_clients(self, clients: List[Dict[str, Any]]) -> int:
+        """
+        Add or update several clients in a single transaction
+        
+        Args:
+            clients: List of client dictionaries, as accepted by add_client
+                
+        Returns:
+            Number of clients stored (entries without a mac_address are skipped)
+        """
+        try:
+            # The upsert needs no existence check first, so the whole batch goes
+            # through one executemany and one commit
+            rows = [_client_params(client_data) for client_data in clients if 'mac_address' in client_data]
+            with self.connection:
+                self.connection.executemany(_UPSERT_CLIENT_SQL, rows)
+            self._maybe_flush()
+            return len(rows)
+                
+        except sqlite3.Error as e:
+            print(f"Error adding clients: {e}")
+            return 0
+    
     def get_network(self, bssid: str) -> Optional[Dict[str, Any]]:
         """Get information about a specific network"""
         try:
-            self.cursor.execute(
-                "SELECT * FROM networks WHERE bssid = ?", 
+            cursor = self.connection.execute(
+                f"SELECT {_NETWORK_COLUMNS} FROM networks WHERE bssid = ?", 
                 (bssid,)
             )
-            result = self.cursor.fetchone()
+            result = cursor.fetchone()
             
             if result:
                 # Convert to dictionary
-                columns = [col[0] for col in self.cursor.description]
-                return dict(zip(columns, result))
+                return dict(result)
             else:
                 return None
                 
@@ -250,14 +257,12 @@ class NetworkDatabase:
             return None
     
     def get_all_networks(self) -> List[Dict[str, Any]]:
-        """Get all networks from the database"""
+        """Get a summary of all networks (no location or notes; see get_network)"""
         try:
-            self.cursor.execute("SELECT * FROM networks ORDER BY last_seen DESC")
-            results = self.cursor.fetchall()
+            cursor = self.connection.execute(f"SELECT {_NETWORK_LIST_COLUMNS} FROM networks ORDER BY last_seen DESC")
             
             # Convert to list of dictionaries
-            columns = [col[0] for col in self.cursor.description]
-            return [dict(zip(columns, row)) for row in results]
+            return [dict(row) for row in cursor.fetchall()]
                 
         except sqlite3.Error as e:
             print(f"Error getting networks: {e}")
@@ -266,15 +271,13 @@ class NetworkDatabase:
     def get_clients_for_network(self, network_id: int) -> List[Dict[str, Any]]:
         """Get all clients associated with a specific network"""
         try:
-            self.cursor.execute(
-                "SELECT * FROM clients WHERE network_id = ? ORDER BY last_seen DESC", 
+            cursor = self.connection.execute(
+                f"SELECT {_CLIENT_COLUMNS} FROM clients WHERE network_id = ? ORDER BY last_seen DESC", 
                 (network_id,)
             )
-            results = self.cursor.fetchall()
             
             # Convert to list of dictionaries
-            columns = [col[0] for col in self.cursor.description]
-            return [dict(zip(columns, row)) for row in results]
+            return [dict(row) for row in cursor.fetchall()]
                 
         except sqlite3.Error as e:
             print(f"Error getting clients: {e}")
@@ -295,69 +298,117 @@ class NetworkDatabase:
             if not filename.lower().endswith('.csv'):
                 filename += '.csv'
                 
-            networks = self.get_all_networks()
+            # Stream rows from the cursor straight into the file in chunks instead
+            # of building a dict per network first
+            cursor = self.connection.execute(f"SELECT {_NETWORK_COLUMNS} FROM networks ORDER BY last_seen DESC")
+            rows = cursor.fetchmany(_EXPORT_CHUNK_SIZE)
             
-            if not networks:
+            if not rows:
                 return "No networks to export"
                 
-            with open(filename, 'w', newline='') as csvfile:
-                # Get all field names from the first network
-                fieldnames = networks[0].keys()
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            with open(filename, 'w', newline='', buffering=1 << 20) as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow([col[0] for col in cursor.description])
                 
-                writer.writeheader()
-                for network in networks:
-                    writer.writerow(network)
+                count = 0
+                while rows:
+                    writer.writerows(rows)
+                    count += len(rows)
+                    rows = cursor.fetchmany(_EXPORT_CHUNK_SIZE)
                     
-            return f"Exported {len(networks)} networks to {filename}"
+            return f"Exported {count} networks to {filename}"
                 
         except Exception as e:
             return f"Error exporting to CSV: {e}"
     
+    def flush(self) -> bool:
+        """
+        Write the in-memory staging database back to disk
+        
+        Returns:
+            True if successful (or not staging in memory), False otherwise
+        """
+        if not self._disk:
+            return True
+            
+        try:
+            self.connection.backup(self._disk)
+            self._last_flush = time.monotonic()
+            return True
+            
+        except sqlite3.Error as e:
+            print(f"Error flushing database to disk: {e}")
+            return False
+    
+    def _maybe_flush(self):
+        """Flush the staging database if flush_interval has passed since the last flush"""
+        if self._disk and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+    
     def close(self):
         """Close the database connection"""
-        if self.connection:
+        # Keep the closed connection object: later calls then raise
+        # sqlite3.ProgrammingError, which the methods already turn into errors
+        if self.connection and not self._closed:
+            try:
+                # Refresh planner statistics where they are stale, so the indexes get
+                # used, and fold the WAL back into the database so the next open is fast
+                self.connection.execute("PRAGMA optimize")
+                self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.Error:
+                pass
+            self.flush()
             self.connection.close()
+            self._closed = True
+            
+        if self._disk:
+            self._disk.close()
+            self._disk = None
             
-    def __del__(self):
-        """Destructor to ensure database is closed"""
+    def __enter__(self):
+        """Use the database as a context manager that closes it on exit"""
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the database when leaving the with block"""
         self.close()
 
 if __name__ == "__main__":
     # Test the database manager
-    db = NetworkDatabase()
-    
-    # Add a test network
-    test_network = {
-        'bssid': '00:11:22:33:44:55',
-        'essid': 'Test Network',
-        'channel': 6,
-        'encryption': 'WPA2',
-        'signal_strength': -65
-    }
-    
-    if db.add_network(test_network):
-        print("Added test network")
-    
-    # Add a test client
-    test_client = {
-        'mac_address': 'AA:BB:CC:DD:EE:FF',
-        'network_id': 1,
-        'probed_essids': 'Test Network,Another Network'
-    }
-    
-    if db.add_client(test_client):
-        print("Added test client")
-    
-    # Get and print networks
-    networks = db.get_all_networks()
-    print(f"Found {len(networks)} networks:")
-    for network in networks:
-        print(f"  {network['bssid']} - {network['essid']}")
-    
-    # Export to CSV
-    result = db.export_to_csv('test_export.csv')
-    print(result)
-    
-    # Close the database
-    db.close() 
\ No newline at end of file
+    with NetworkDatabase() as db:
+        
+        # Add a test network
+        test_network = {
+            'bssid': '00:11:22:33:44:55',
+            'essid': 'Test Network',
+            'channel': 6,
+            'encryption': 'WPA2',
+            'signal_strength': -65
+        }
+        
+        if db.add_network(test_network):
+            print("Added test network")
+        
+        # Add a test client
+        test_client = {
+            'mac_address': 'AA:BB:CC:DD:EE:FF',
+            'network_id': 1,
+            'probed_essids': 'Test Network,Another Network'
+        }
+        
+        if db.add_client(test_client):
+            print("Added test client")
+        
+        # Get and print networks
+        networks = db.get_all_networks()
+        print(f"Found {len(networks)} networks:")
+        for network in networks:
+            print(f"  {network['bssid']} - {network['essid']}")
+        
+        # Export to CSV
+        result = db.export_to_csv('test_export.csv')
+        print(result)
+        
+    # A closed database reports failure instead of raising
+    assert db.add_network(test_network) is False
+    print("Closed database rejected write") 
\ No newline at end of file
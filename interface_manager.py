@@ -3,10 +3,25 @@
 # Handles wireless interface management functions
 
 import os
+import shutil
 import subprocess
 import re
 from typing import List, Dict, Optional, Any
 
+# Patterns for parsing tool output, compiled once at import
+_MAC_PATTERN = r'[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}'
+_IP_LINK_MAC_RE = re.compile(r'link/ether\s+(' + _MAC_PATTERN + ')')
+_IFCONFIG_MAC_RE = re.compile(r'(?:ether|HWaddr)\s+(' + _MAC_PATTERN + ')')
+_MONITOR_IFACE_RE = re.compile(r'monitor mode (?:enabled|vif) on\s+([^\s\)]+)')
+_MANAGED_IFACE_RE = re.compile(r'(?:mode disabled on|switched to managed mode)\s+([^\s\)]+)')
+
+# Seconds to wait for quick interface queries (iw, ip, ifconfig, netsh) before giving up
+_QUERY_TIMEOUT = 10
+
+def is_tool_available(tool_name: str) -> bool:
+    """Check if a command-line tool is available on PATH"""
+    return shutil.which(tool_name) is not None
+
 class InterfaceManager:
     """Class to manage wireless network interfaces"""
     
@@ -26,7 +41,7 @@ class InterfaceManager:
         
         try:
             # Try using iw dev first (Linux)
-            result = subprocess.run(["iw", "dev"], capture_output=True, text=True)
+            result = subprocess.run(["iw", "dev"], capture_output=True, text=True, timeout=_QUERY_TIMEOUT)
             
             if result.returncode == 0:
                 # Parse iw dev output
@@ -57,7 +72,7 @@ class InterfaceManager:
             
             # If iw dev fails or returns no interfaces, try ip link (more generic)
             if not interfaces and os.name != "nt":  # Not on Windows
-                result = subprocess.run(["ip", "link"], capture_output=True, text=True)
+                result = subprocess.run(["ip", "link"], capture_output=True, text=True, timeout=_QUERY_TIMEOUT)
                 
                 if result.returncode == 0:
                     for line in result.stdout.splitlines():
@@ -75,7 +90,7 @@ class InterfaceManager:
             
             # On Windows, try netsh (or other Windows-specific methods)
             if not interfaces and os.name == "nt":
-                result = subprocess.run(["netsh", "wlan", "show", "interfaces"], capture_output=True, text=True)
+                result = subprocess.run(["netsh", "wlan", "show", "interfaces"], capture_output=True, text=True, timeout=_QUERY_TIMEOUT)
                 
                 if result.returncode == 0:
                     current_interface = None
@@ -106,18 +121,18 @@ class InterfaceManager:
         """Get MAC address for a given interface"""
         try:
             # Try using ip link command (Linux)
-            result = subprocess.run(["ip", "link", "show", interface_name], capture_output=True, text=True)
+            result = subprocess.run(["ip", "link", "show", interface_name], capture_output=True, text=True, timeout=_QUERY_TIMEOUT)
             
             if result.returncode == 0:
-                mac_match = re.search(r'link/ether\s+([0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2})', result.stdout)
+                mac_match = _IP_LINK_MAC_RE.search(result.stdout)
                 if mac_match:
                     return mac_match.group(1).upper()
             
             # Fallback to ifconfig for systems that have it
-            result = subprocess.run(["ifconfig", interface_name], capture_output=True, text=True)
+            result = subprocess.run(["ifconfig", interface_name], capture_output=True, text=True, timeout=_QUERY_TIMEOUT)
             
             if result.returncode == 0:
-                mac_match = re.search(r'(?:ether|HWaddr)\s+([0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2}:[0-9A-Fa-f]{2})', result.stdout)
+                mac_match = _IFCONFIG_MAC_RE.search(result.stdout)
                 if mac_match:
                     return mac_match.group(1).upper()
             
@@ -138,8 +153,7 @@ class InterfaceManager:
         """
         try:
             # Check if airmon-ng is available
-            airmon_check = subprocess.run(["which", "airmon-ng"], capture_output=True, text=True)
-            if airmon_check.returncode != 0:
+            if not is_tool_available("airmon-ng"):
                 return "Error: airmon-ng not found. Make sure it's installed."
             
             # Kill potential interfering processes
@@ -155,7 +169,7 @@ class InterfaceManager:
                 monitor_interface = f"{interface_name}mon"
             else:
                 # Try to parse the output to find the actual name
-                match = re.search(r'monitor mode (?:enabled|vif) on\s+([^\s\)]+)', result.stdout)
+                match = _MONITOR_IFACE_RE.search(result.stdout)
                 if match:
                     monitor_interface = match.group(1)
             
@@ -180,8 +194,7 @@ class InterfaceManager:
         """
         try:
             # Check if airmon-ng is available
-            airmon_check = subprocess.run(["which", "airmon-ng"], capture_output=True, text=True)
-            if airmon_check.returncode != 0:
+            if not is_tool_available("airmon-ng"):
                 return "Error: airmon-ng not found. Make sure it's installed."
             
             # Stop monitor mode
@@ -189,7 +202,7 @@ class InterfaceManager:
             
             # Try to find the managed interface name from the output
             managed_interface = None
-            match = re.search(r'(?:mode disabled on|switched to managed mode)\s+([^\s\)]+)', result.stdout)
+            match = _MANAGED_IFACE_RE.search(result.stdout)
             if match:
                 managed_interface = match.group(1)
                 
@@ -4,6 +4,7 @@
 
 import argparse
 import configparser
+import io
 import os
 import sys
 from pathlib import Path
@@ -21,9 +22,14 @@ DEFAULT_CONFIG = {
     }
 }
 
+# Locations of the config file and saved session data
+CONFIG_PATH = Path("~/.config/paw/config.ini").expanduser()
+HISTORY_FILE = Path("~/.local/share/paw/history/commands_history.txt").expanduser()
+LAST_OUTPUT_FILE = Path("~/.local/share/paw/last_output.txt").expanduser()
+
 def get_config_path():
     """Return the path to the config file."""
-    return os.path.expanduser("~/.config/paw/config.ini")
+    return CONFIG_PATH
 
 def load_config():
     """Load the configuration from the config file."""
@@ -38,27 +44,34 @@ def load_config():
             if not config.has_option(section, key):
                 config.set(section, key, value)
     
-    # Read the config file if it exists
-    if os.path.exists(config_path):
-        config.read(config_path)
+    # Read the config file if it exists (missing files are skipped by read())
+    config.read(config_path)
     
     return config
 
 def save_config(config):
     """Save the configuration to the config file."""
     config_path = get_config_path()
-    os.makedirs(os.path.dirname(config_path), exist_ok=True)
-    
-    with open(config_path, 'w') as f:
-        config.write(f)
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    # Render in memory so the file is written with a single write() call
+    buffer = io.StringIO()
+    config.write(buffer)
+    
+    # Write to a temporary file and swap it in, so a crash mid-write never
+    # leaves a truncated config behind
+    tmp_path = config_path.with_name(config_path.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        f.write(buffer.getvalue())
+    os.replace(tmp_path, config_path)
 
 def show_config(config):
     """Display the current configuration."""
-    print("Current PAW Configuration:")
+    lines = ["Current PAW Configuration:"]
     for section in config.sections():
-        print(f"\n[{section}]")
-        for key, value in config.items(section):
-            print(f"{key} = {value}")
+        lines.append(f"\n[{section}]")
+        lines.extend(f"{key} = {value}" for key, value in config.items(section))
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def set_config(config, section, key, value):
     """Set a configuration value."""
@@ -95,50 +108,46 @@ def list_available_models():
 
 def clear_command_history():
     """Clear the saved command history."""
-    history_dir = os.path.expanduser("~/.local/share/paw/history")
-    history_file = os.path.join(history_dir, "commands_history.txt")
-    
-    if os.path.exists(history_file):
-        try:
-            os.remove(history_file)
-            print("Command history has been cleared.")
-        except Exception as e:
-            print(f"Error clearing command history: {e}")
-    else:
+    try:
+        HISTORY_FILE.unlink()
+        print("Command history has been cleared.")
+    except FileNotFoundError:
         print("No command history found.")
+    except Exception as e:
+        print(f"Error clearing command history: {e}")
 
 def clear_last_output():
     """Clear the saved last command output."""
-    last_output_file = os.path.expanduser("~/.local/share/paw/last_output.txt")
-    
-    if os.path.exists(last_output_file):
-        try:
-            os.remove(last_output_file)
-            print("Last command output has been cleared.")
-        except Exception as e:
-            print(f"Error clearing last command output: {e}")
-    else:
+    try:
+        LAST_OUTPUT_FILE.unlink()
+        print("Last command output has been cleared.")
+    except FileNotFoundError:
         print("No saved command output found.")
+    except Exception as e:
+        print(f"Error clearing last command output: {e}")
 
 def show_last_output():
     """Display the saved last command output."""
-    last_output_file = os.path.expanduser("~/.local/share/paw/last_output.txt")
-    
-    if os.path.exists(last_output_file):
-        try:
-            with open(last_output_file, 'r') as f:
-                content = f.read()
-            if content.strip():
-                print("Last Command Output:")
-                print("--------------------")
-                print(content)
-                print("--------------------")
-            else:
-                print("Last command output is empty.")
-        except Exception as e:
-            print(f"Error reading last command output: {e}")
-    else:
+    try:
+        # An empty file needs no read; only load the contents when there are some
+        if LAST_OUTPUT_FILE.stat().st_size == 0:
+            content = ""
+        else:
+            content = LAST_OUTPUT_FILE.read_text()
+    except FileNotFoundError:
         print("No saved command output found.")
+        return
+    except Exception as e:
+        print(f"Error reading last command output: {e}")
+        return
+    
+    if content.strip():
+        print("Last Command Output:")
+        print("--------------------")
+        print(content)
+        print("--------------------")
+    else:
+        print("Last command output is empty.")
 
 def main():
     parser = argparse.ArgumentParser(description="PAW Configuration Utility")
@@ -6,12 +6,14 @@
 import os
 import sys
 import argparse
+import atexit
 import subprocess
 import time
 import random
 import re
 import signal
 import platform
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple, Any
 import traceback
 
@@ -45,7 +47,7 @@ except ImportError:
 # Import PAW modules
 try:
     from context_lib import get_context_for_prompt
-    from interface_manager import InterfaceManager
+    from interface_manager import InterfaceManager, is_tool_available
     from prompts_lib import AIRCRACK_PROMPTS, NETWORK_PROMPTS
     from tool_executor import execute_tool_command, parse_tool_command
     from db_manager import NetworkDatabase
@@ -59,6 +61,7 @@ except ImportError as e:
 console = Console() if RICH_AVAILABLE else None
 interface_manager = InterfaceManager()
 db = NetworkDatabase()
+atexit.register(db.close)
 last_command_output = None
 use_context = True
 
@@ -74,6 +77,53 @@ COMPLETION_KEYWORDS = [
     "metasploit", "msfconsole", "wireshark", "tshark", "macchanger"
 ]
 
+# Command patterns for suggest mode, keyed by trigger phrase
+COMMAND_PATTERNS = {
+    "monitor mode": [
+        "# Enable monitor mode on wireless interface",
+        "airmon-ng check kill",
+        "airmon-ng start wlan0  # Replace wlan0 with your interface"
+    ],
+    "scan network": [
+        "# Scan for wireless networks",
+        "airodump-ng wlan0mon  # Replace wlan0mon with your monitor interface"
+    ],
+    "capture handshake": [
+        "# Capture WPA handshake",
+        "airodump-ng -c [CHANNEL] --bssid [MAC_ADDRESS] -w capture wlan0mon",
+        "# In a new terminal window, run:",
+        "aireplay-ng -0 5 -a [MAC_ADDRESS] -c [CLIENT_MAC] wlan0mon"
+    ],
+    "crack password": [
+        "# Crack captured handshake",
+        "aircrack-ng -w /path/to/wordlist.txt capture*.cap"
+    ],
+    "deauth": [
+        "# Deauthenticate client(s) from access point",
+        "aireplay-ng -0 10 -a [AP_MAC] -c [CLIENT_MAC] wlan0mon  # Specific client",
+        "# Or to deauthenticate all clients:",
+        "aireplay-ng -0 10 -a [AP_MAC] wlan0mon"
+    ],
+    "scan port": [
+        "# Basic port scan",
+        "nmap [TARGET_IP]",
+        "# More comprehensive scan",
+        "nmap -sV -p- -A [TARGET_IP]"
+    ],
+    "change mac": [
+        "# Change MAC address",
+        "ifconfig [INTERFACE] down",
+        "macchanger -r [INTERFACE]  # Random MAC",
+        "# Or specify a MAC:",
+        "macchanger -m XX:XX:XX:XX:XX:XX [INTERFACE]",
+        "ifconfig [INTERFACE] up"
+    ],
+    "wps attack": [
+        "# WPS attack using Reaver",
+        "reaver -i wlan0mon -b [TARGET_BSSID] -vv"
+    ]
+}
+
 # Setup readline completion
 def setup_readline():
     """Setup readline for history and completion"""
@@ -167,8 +217,9 @@ def prompt_for_context_preference():
         else:
             print("Next command will start fresh (no context from previous output)")
 
-def handle_macchanger_command(args: List[str]) -> None:
-    """Handle MAC address changing commands with macchanger"""
+@lru_cache(maxsize=None)
+def get_macchanger_parser() -> argparse.ArgumentParser:
+    """Build the macchanger argument parser once and reuse it for every command"""
     parser = argparse.ArgumentParser(prog="macchanger", 
                                     description="Change MAC address using macchanger")
     parser.add_argument("interface", help="Network interface to modify")
@@ -186,6 +237,11 @@ def handle_macchanger_command(args: List[str]) -> None:
                        help="Show current MAC address")
     parser.add_argument("-l", "--list", action="store_true", 
                        help="List known vendors")
+    return parser
+
+def handle_macchanger_command(args: List[str]) -> None:
+    """Handle MAC address changing commands with macchanger"""
+    parser = get_macchanger_parser()
     
     try:
         # Parse arguments - using args[1:] to skip the 'macchanger' command itself
@@ -257,15 +313,6 @@ def handle_macchanger_command(args: List[str]) -> None:
         display_output(f"Error: {str(e)}", "MAC Changer Error")
         traceback.print_exc()
 
-def is_tool_available(tool_name: str) -> bool:
-    """Check if a command-line tool is available"""
-    try:
-        devnull = open(os.devnull, 'w')
-        subprocess.Popen([tool_name, "--help"], stdout=devnull, stderr=devnull).communicate()
-        return True
-    except OSError:
-        return False
-
 def execute_command(command: List[str]) -> str:
     """Execute a shell command and return the output"""
     try:
@@ -448,9 +495,13 @@ def handle_interface_command(args: List[str]) -> None:
             
             console.print(table)
         else:
-            print("Wireless Interfaces:")
-            for iface in interfaces:
-                print(f"  {iface['name']} - MAC: {iface.get('mac_address', 'Unknown')} - Mode: {iface.get('mode', 'Unknown')}")
+            # Build the listing and write it in one go rather than a print per row
+            lines = ["Wireless Interfaces:"]
+            lines.extend(
+                f"  {iface['name']} - MAC: {iface.get('mac_address', 'Unknown')} - Mode: {iface.get('mode', 'Unknown')}"
+                for iface in interfaces
+            )
+            sys.stdout.write("\n".join(lines) + "\n")
     
     elif subcommand == "monitor":
         if len(args) < 3:
@@ -768,9 +819,13 @@ def handle_database_command(args: List[str]) -> None:
             
             console.print(table)
         else:
-            print("Saved Networks:")
-            for network in networks:
-                print(f"  {network.get('bssid', 'Unknown')} - {network.get('essid', 'Unknown')} - CH:{network.get('channel', '?')} - {network.get('encryption', 'Unknown')}")
+            # Build the listing and write it in one go rather than a print per row
+            lines = ["Saved Networks:"]
+            lines.extend(
+                f"  {network.get('bssid', 'Unknown')} - {network.get('essid', 'Unknown')} - CH:{network.get('channel', '?')} - {network.get('encryption', 'Unknown')}"
+                for network in networks
+            )
+            sys.stdout.write("\n".join(lines) + "\n")
     
     elif subcommand == "export":
         # Export database to CSV
@@ -795,58 +850,11 @@ def suggest_commands(prompt: str) -> str:
     Returns:
         A string containing the suggested commands
     """
-    # Common command patterns based on keywords
-    command_patterns = {
-        "monitor mode": [
-            "# Enable monitor mode on wireless interface",
-            "airmon-ng check kill",
-            "airmon-ng start wlan0  # Replace wlan0 with your interface"
-        ],
-        "scan network": [
-            "# Scan for wireless networks",
-            "airodump-ng wlan0mon  # Replace wlan0mon with your monitor interface"
-        ],
-        "capture handshake": [
-            "# Capture WPA handshake",
-            "airodump-ng -c [CHANNEL] --bssid [MAC_ADDRESS] -w capture wlan0mon",
-            "# In a new terminal window, run:",
-            "aireplay-ng -0 5 -a [MAC_ADDRESS] -c [CLIENT_MAC] wlan0mon"
-        ],
-        "crack password": [
-            "# Crack captured handshake",
-            "aircrack-ng -w /path/to/wordlist.txt capture*.cap"
-        ],
-        "deauth": [
-            "# Deauthenticate client(s) from access point",
-            "aireplay-ng -0 10 -a [AP_MAC] -c [CLIENT_MAC] wlan0mon  # Specific client",
-            "# Or to deauthenticate all clients:",
-            "aireplay-ng -0 10 -a [AP_MAC] wlan0mon"
-        ],
-        "scan port": [
-            "# Basic port scan",
-            "nmap [TARGET_IP]",
-            "# More comprehensive scan",
-            "nmap -sV -p- -A [TARGET_IP]"
-        ],
-        "change mac": [
-            "# Change MAC address",
-            "ifconfig [INTERFACE] down",
-            "macchanger -r [INTERFACE]  # Random MAC",
-            "# Or specify a MAC:",
-            "macchanger -m XX:XX:XX:XX:XX:XX [INTERFACE]",
-            "ifconfig [INTERFACE] up"
-        ],
-        "wps attack": [
-            "# WPS attack using Reaver",
-            "reaver -i wlan0mon -b [TARGET_BSSID] -vv"
-        ]
-    }
-    
     prompt_lower = prompt.lower()
     results = []
     
     # Check for exact matches first
-    for key_phrase, commands in command_patterns.items():
+    for key_phrase, commands in COMMAND_PATTERNS.items():
         if key_phrase in prompt_lower:
             results.extend(commands)
     
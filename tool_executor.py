@@ -28,6 +28,19 @@ def parse_tool_command(command: str) -> Tuple[Optional[List[str]], Optional[str]
         parts = shlex.split(command)
         tool = parts[0]
         
+        # Match options against whole arguments; a substring test on the raw
+        # command would also fire on paths and values (e.g. "-w" in "rock-wpa.txt").
+        # getopt lets an option carry its value in the same argument, so reduce
+        # "--opt=value" to "--opt" and "-xvalue" to "-x"
+        args = set()
+        for arg in parts[1:]:
+            if arg.startswith("--"):
+                args.add(arg.split('=', 1)[0])
+            elif arg.startswith("-") and len(arg) > 2:
+                args.add(arg[:2])
+            else:
+                args.add(arg)
+        
         # Provide explanations based on common command patterns
         explanation = None
         
@@ -46,24 +59,24 @@ def parse_tool_command(command: str) -> Tuple[Optional[List[str]], Optional[str]
                 
         elif tool == "airodump-ng":
             explanation = "Capturing wireless packets"
-            if "--bssid" in command:
+            if "--bssid" in args:
                 explanation = "Capturing packets for a specific access point"
-            if "-w" in command or "--write" in command:
+            if "-w" in args or "--write" in args:
                 explanation += " and saving to file"
                 
         elif tool == "aireplay-ng":
-            if "-0" in command or "--deauth" in command:
+            if "-0" in args or "--deauth" in args:
                 explanation = "Performing deauthentication attack"
-            elif "-1" in command or "--fakeauth" in command:
+            elif "-1" in args or "--fakeauth" in args:
                 explanation = "Performing fake authentication"
-            elif "-3" in command or "--arpreplay" in command:
+            elif "-3" in args or "--arpreplay" in args:
                 explanation = "Performing ARP replay attack"
             else:
                 explanation = "Performing packet injection"
                 
         elif tool == "aircrack-ng":
             explanation = "Attempting to crack wireless keys"
-            if "-w" in command:
+            if "-w" in args:
                 explanation += " using a wordlist"
                 
         # Return the command as is - it's a valid tool